@@ -1,91 +1,391 @@
 # Import necessary libraries
-import gradio as gr          # For creating the web-based graphical user interface (GUI)
-import requests              # For making HTTP requests to fetch web pages (used for fallback/link discovery)
-from bs4 import BeautifulSoup # For parsing HTML documents (used for generic link discovery)
-import html2text             # For converting HTML content to Markdown format
-import PyPDF2                # For extracting text from PDF files
+import httpx                 # For making asynchronous HTTP/2 requests to fetch web pages
+import lxml.html             # For parsing HTML documents (used for generic link discovery)
+import lxml.etree            # For compiled XPath queries over parsed pages
 import re                    # For regular expressions (used for minor text cleaning and URL validation)
-import json                  # For working with JSON data (input/output format)
-from urllib.parse import urlparse, urljoin # For parsing, joining, and normalizing URLs
+from urllib.parse import urlparse, urljoin, urlunparse, parse_qsl, urlencode # For parsing, joining, and normalizing URLs
 import os                    # For operating system related functionalities (e.g., getting file basename)
 import time                  # For adding delays to be polite to web servers
-from collections import deque # For implementing a queue for URL processing
+import threading             # For per-host politeness state and per-thread parsers
+import asyncio               # For fetching several URLs concurrently on one event loop
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor # For running CPU-heavy work alongside the crawl
+from concurrent.futures.process import BrokenProcessPool # Raised once a pool worker has died (e.g. OOM-killed)
+import multiprocessing       # For choosing how the CPU pool's worker processes are started
+from collections import deque, defaultdict # For implementing a queue for URL processing
+import importlib.util        # For checking whether optional extras (e.g. HTTP/2 support) are installed
+import functools             # For memoizing per-URL helpers called once per discovered link
+import logging               # For progress and error messages (formatted only when actually emitted)
+import hashlib               # For fingerprinting article content to skip duplicates
+import json                  # Fallback serializer for the NDJSON output when orjson is not installed
+import tempfile              # For the per-run directories the NDJSON output is streamed to
+import shutil                # For removing old output directories
+
+logger = logging.getLogger(__name__)
 
 # Import the 'trafilatura' library for generic article extraction.
 # This is the core component that enables "no custom code" for websites.
 try:
     import trafilatura
+    from trafilatura.sitemaps import sitemap_search # For jumping straight to article URLs listed in a site's sitemaps
+    from trafilatura.utils import decode_file # For guessing the encoding of pages that do not declare one
 except ImportError:
-    print("Error: 'trafilatura' library not found. Please install it by running: pip install trafilatura")
+    sitemap_search = None
+    decode_file = None
+    logger.error("Error: 'trafilatura' library not found. Please install it by running: pip install trafilatura")
     # Provide a dummy function to allow the script to be parsed even if the library isn't installed.
     def trafilatura_extract(html, url, output_format, include_comments, include_links, include_formatting):
         raise NotImplementedError("trafilatura not installed. Please install it via 'pip install trafilatura'")
     def trafilatura_fetch_url(url):
         raise NotImplementedError("trafilatura not installed. Please install it via 'pip install trafilatura'")
 
+# Prefer PyMuPDF (fitz) for PDF text extraction; its C engine is roughly an order of magnitude
+# faster than the pure-Python PyPDF2, which remains the fallback.
+# Recent releases are imported as `pymupdf` (importing the legacy `fitz` name prints a
+# deprecation notice, once per CPU pool worker); older ones only provide `fitz`.
+try:
+    import pymupdf as fitz
+except ImportError:
+    try:
+        import fitz
+    except ImportError:
+        fitz = None
+
+# selectolax's Lexbor parser is the fastest option for the read-only queries link discovery
+# needs. lxml (always installed, as trafilatura depends on it) is the fallback.
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# orjson serializes the scraped items several times faster than the stdlib `json`
+# module, which remains the fallback.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # --- SECTION 1: CORE HELPER FUNCTIONS ---
 # These functions perform fundamental tasks: fetching HTML, converting formats, and URL manipulation.
 
-def get_html_content_basic(url):
+# Maximum number of URLs in flight at once during a crawl. The work is network-bound,
+# so overlapping requests hides most of the round-trip latency.
+MAX_CONCURRENT_FETCHES = 32
+
+# Maximum number of simultaneous requests to any single host.
+MAX_FETCHES_PER_HOST = 2
+
+# Minimum delay (in seconds) between two requests to the same host.
+POLITE_DELAY_SECONDS = 1.0
+
+# Start method for the CPU pool's workers. Forking a process that is already running threads
+# (Gradio's server, the crawl's worker threads) can deadlock, so workers are started from a
+# clean fork server where available (POSIX) and spawned otherwise (Windows).
+CPU_POOL_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+# Sitemap discovery for start URLs (done by trafilatura's own downloader): at most this many
+# sitemaps are fetched, and the whole search is abandoned in favour of the page's own links
+# after this many seconds, so a huge sitemap index cannot stall the crawl.
+SITEMAP_MAX_SITEMAPS = 15
+SITEMAP_TIMEOUT_SECONDS = 30.0
+
+# At most this many article URLs from a start URL's sitemaps are queued. A homepage's
+# sitemaps are not narrowed to any path and can list tens of thousands of URLs.
+SITEMAP_MAX_URLS = 1000
+
+# How many times a failed connection attempt (e.g. a refused or timed-out connect) is retried.
+CONNECT_RETRIES = 2
+
+# Browser-like headers sent with every request.
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# HTTP/2 needs the `h2` package (installed by `pip install httpx[http2]`). With it, concurrent
+# requests to the same host are multiplexed over one connection with compressed headers.
+HTTP2_ENABLED = importlib.util.find_spec('h2') is not None
+
+def create_http_client():
+    """
+    Creates the asynchronous HTTP client shared by all fetches of one crawl.
+    Reusing one client keeps TCP/TLS connections alive across URLs instead of
+    paying a fresh handshake for every page. Failed connection attempts are retried.
+    
+    Returns:
+        httpx.AsyncClient: A client with browser-like headers, pooled connections and a timeout.
+    """
+    transport = httpx.AsyncHTTPTransport(
+        http2=HTTP2_ENABLED,
+        limits=httpx.Limits(max_connections=MAX_CONCURRENT_FETCHES, max_keepalive_connections=MAX_CONCURRENT_FETCHES),
+        retries=CONNECT_RETRIES,
+    )
+    return httpx.AsyncClient(
+        transport=transport,
+        headers=REQUEST_HEADERS,
+        timeout=30,
+        follow_redirects=True,
+    )
+
+def configure_console_logging(level=logging.INFO):
+    """
+    Shows this tool's progress messages in the console (per-link discovery messages are DEBUG).
+    Only our logger gets the handler, so httpx/trafilatura request logs stay quiet.
+    Called by the entry point, and by each CPU pool worker so that messages logged
+    during article or PDF extraction are not lost.
+    
+    Args:
+        level (int): The minimum level of messages to show.
+    """
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(console_handler)
+    logger.setLevel(level)
+
+# Pool for CPU-bound work (article extraction, PDF text extraction). Running it in
+# separate processes lets it use other cores instead of competing with the crawl for the GIL.
+# Created on first use and replaced if a worker dies, since a broken pool rejects all new work.
+_cpu_pool = None
+_cpu_pool_lock = threading.Lock()
+
+def get_cpu_pool():
+    """
+    Returns the shared process pool for CPU-bound work, creating it if needed.
+    
+    Returns:
+        ProcessPoolExecutor: The current CPU pool.
+    """
+    global _cpu_pool
+    with _cpu_pool_lock:
+        if _cpu_pool is None:
+            # Workers start with logging unconfigured; give them the same console output as this process
+            _cpu_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                mp_context=multiprocessing.get_context(CPU_POOL_START_METHOD),
+                initializer=configure_console_logging if logger.handlers else None,
+                initargs=(logger.level,),
+            )
+        return _cpu_pool
+
+def discard_cpu_pool(pool):
+    """
+    Drops a broken CPU pool so the next `get_cpu_pool` call builds a fresh one.
+    Safe to call from several callers that saw the same pool break.
+    
+    Args:
+        pool (ProcessPoolExecutor): The pool that raised `BrokenProcessPool`.
+    """
+    global _cpu_pool
+    with _cpu_pool_lock:
+        if _cpu_pool is pool:
+            _cpu_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+async def run_in_cpu_pool(func, *args):
+    """
+    Runs `func(*args)` in the CPU pool without blocking the event loop. If the pool
+    turns out to be broken, it is replaced and the call is retried once.
+    
+    Args:
+        func (callable): A module-level (picklable) function.
+        *args: The arguments to call it with.
+        
+    Returns:
+        The function's return value.
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_cpu_pool()
+    try:
+        return await loop.run_in_executor(pool, func, *args)
+    except BrokenProcessPool:
+        logger.warning("CPU pool worker died; restarting the pool")
+        discard_cpu_pool(pool)
+        return await loop.run_in_executor(get_cpu_pool(), func, *args)
+
+def map_in_cpu_pool(func, *iterables):
     """
-    Fetches raw HTML content from a given URL using requests.
-    This is used as a fallback for `trafilatura.fetch_url` or specifically for
-    discovering links on index pages (where `trafilatura`'s full article extraction
-    isn't needed at this stage). Includes robust headers and timeouts.
+    Like `map(func, *iterables)`, but runs the calls in parallel in the CPU pool.
+    If the pool turns out to be broken, it is replaced and the map is retried once.
     
     Args:
+        func (callable): A module-level (picklable) function.
+        *iterables: The argument sequences (each must be reusable, e.g. a list or range).
+        
+    Returns:
+        list: The results, in input order.
+    """
+    pool = get_cpu_pool()
+    try:
+        return list(pool.map(func, *iterables))
+    except BrokenProcessPool:
+        logger.warning("CPU pool worker died; restarting the pool")
+        discard_cpu_pool(pool)
+        return list(get_cpu_pool().map(func, *iterables))
+
+async def run_in_daemon_thread(func, *args, **kwargs):
+    """
+    Runs `func(*args, **kwargs)` on a new daemon thread and awaits its result.
+    Unlike `asyncio.to_thread`, the thread is not part of the event loop's default
+    executor, so a caller that stops waiting (e.g. via `asyncio.wait_for`) is not held
+    up again when `asyncio.run` shuts that executor down; the abandoned thread simply
+    finishes on its own (or dies with the process).
+    
+    Args:
+        func (callable): The blocking function to run.
+        *args, **kwargs: The arguments to call it with.
+        
+    Returns:
+        The function's return value.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def deliver(set_outcome, outcome):
+        if not future.done(): # The caller may have stopped waiting
+            set_outcome(outcome)
+
+    def target():
+        try:
+            outcome = (future.set_result, func(*args, **kwargs))
+        except Exception as e:
+            outcome = (future.set_exception, e)
+        try:
+            loop.call_soon_threadsafe(deliver, *outcome)
+        except RuntimeError:
+            pass # The event loop has already closed; nobody is waiting for the result
+
+    threading.Thread(target=target, daemon=True).start()
+    return await future
+
+# Per-host politeness state: the earliest time (time.monotonic) the next request to each host may start.
+_host_next_slot = {}
+_host_slot_lock = threading.Lock()
+
+def reserve_host_slot(url):
+    """
+    Reserves the next polite request slot for the host of `url`.
+    Requests to the same host are spaced `POLITE_DELAY_SECONDS` apart, while requests
+    to different hosts are not delayed by each other.
+    
+    Args:
+        url (str): The URL about to be fetched.
+        
+    Returns:
+        float: How many seconds the caller should wait before sending the request.
+    """
+    host = urlparse(url).netloc
+    with _host_slot_lock:
+        now = time.monotonic()
+        slot = max(now, _host_next_slot.get(host, 0.0))
+        _host_next_slot[host] = slot + POLITE_DELAY_SECONDS
+    return slot - now
+
+# Finds a <meta charset="..."> or <meta http-equiv="Content-Type" content="...; charset=...">
+# declaration; only the start of the document is searched, as browsers do.
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+_META_CHARSET_SEARCH_BYTES = 4096
+
+def decode_html(content, declared_charset=None):
+    """
+    Decodes a downloaded page to text, in the order browsers do: the charset from
+    the HTTP Content-Type header, then the page's own <meta charset>, then UTF-8,
+    and finally a statistical guess. Decoding once here means every parser
+    (trafilatura, selectolax, lxml) sees the same, correctly decoded text;
+    selectolax in particular ignores <meta charset> and would assume UTF-8.
+    
+    Args:
+        content (bytes): The raw response body.
+        declared_charset (str or None): The charset named in the Content-Type header, if any.
+        
+    Returns:
+        str: The decoded HTML.
+    """
+    candidate_charsets = []
+    if declared_charset:
+        candidate_charsets.append(declared_charset)
+    meta_match = _META_CHARSET_RE.search(content, 0, _META_CHARSET_SEARCH_BYTES)
+    if meta_match:
+        candidate_charsets.append(meta_match.group(1).decode('ascii'))
+    candidate_charsets.append('utf-8')
+
+    for charset in candidate_charsets:
+        try:
+            return content.decode(charset)
+        except (LookupError, UnicodeDecodeError):
+            continue # Unknown or wrong charset: try the next candidate
+    if decode_file is not None:
+        return decode_file(content)
+    return content.decode('utf-8', errors='replace')
+
+async def fetch_html(client, url):
+    """
+    Fetches HTML content from a given URL.
+    The page is downloaded once and then used both for article extraction and,
+    if the page turns out not to be an article, for link discovery.
+    
+    Args:
+        client (httpx.AsyncClient): The crawl's shared HTTP client.
         url (str): The URL of the web page to fetch.
     
     Returns:
-        str or None: The HTML content as a string if successful, otherwise None.
+        str or None: The HTML content, decoded by `decode_html`, if successful, otherwise None.
     """
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()  # Raise an HTTPError for bad responses (4xx or 5xx)
-        return response.text
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching URL {url} with basic requests: {e}")
+        response = await client.get(url)
+        response.raise_for_status()  # Raise an HTTPStatusError for bad responses (4xx or 5xx)
+        return decode_html(response.content, response.charset_encoding)
+    except httpx.HTTPError as e:
+        logger.warning("Error fetching URL %s with httpx: %s", url, e)
         return None
 
-def html_to_markdown(html_content):
+# Matches runs of blank (or whitespace-only) lines; compiled once at import time.
+_BLANK_LINE_RE = re.compile(r'\n\s*\n')
+
+def tidy_markdown(markdown):
     """
-    Converts HTML content to a clean Markdown format.
-    Used for both `trafilatura`'s extracted HTML and for fallback HTML content.
+    Tidies Markdown produced by `trafilatura`, collapsing runs of blank lines
+    and trimming surrounding whitespace.
     Ensures that the output content meets the 'Markdown content' requirement.
     
     Args:
-        html_content (str): The HTML string to convert.
+        markdown (str): The Markdown string to tidy.
         
     Returns:
-        str: The converted Markdown string.
+        str: The tidied Markdown string.
     """
-    if not html_content:
+    if not markdown:
         return ""
-    h = html2text.HTML2Text()
-    h.ignore_links = False
-    h.ignore_images = False
-    h.body_width = 0
-    h.unicode_snob = True
-    h.skip_internal_links = True
-    h.wrap_links = False
-    h.mark_code = True
-    
-    markdown = h.handle(html_content)
-    markdown = re.sub(r'\n\s*\n', '\n\n', markdown) # Clean up excessive blank lines
+    markdown = _BLANK_LINE_RE.sub('\n\n', markdown) # Clean up excessive blank lines
     return markdown.strip()
 
+# PDFs with fewer pages than this are extracted in-process; for them, starting
+# worker processes would cost more than it saves.
+PARALLEL_PDF_MIN_PAGES = 8
+
+def extract_pdf_page_range(pdf_file_path, start, stop):
+    """
+    Extracts the text of pages `start` to `stop - 1` of a PDF with PyMuPDF.
+    Runs in a CPU pool worker, which opens its own handle to the file.
+    
+    Args:
+        pdf_file_path (str): The path to the PDF file.
+        start (int): Index of the first page to extract.
+        stop (int): Index one past the last page to extract.
+        
+    Returns:
+        list: The text of each page in the range, in page order.
+    """
+    with fitz.open(pdf_file_path) as doc:
+        return [doc.load_page(page_num).get_text("text") for page_num in range(start, stop)]
+
 def extract_text_from_pdf(pdf_file_path):
     """
-    Extracts plain text content from a PDF file using PyPDF2.
+    Extracts plain text content from a PDF file using PyMuPDF (or PyPDF2 if it is not installed).
     Handles the ingestion of PDF documents, fulfilling the 'Aline's Book' requirement.
+    With PyMuPDF, longer documents are split into page ranges extracted in parallel
+    across the CPU pool workers.
     
     Args:
         pdf_file_path (str): The path to the PDF file.
@@ -93,22 +393,45 @@ def extract_text_from_pdf(pdf_file_path):
     Returns:
         str or None: The extracted text content, or None if an error occurs.
     """
-    text = ""
+    page_texts = [] # Collected per page and joined once, instead of repeated string concatenation
     try:
-        with open(pdf_file_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            for page_num in range(len(reader.pages)):
-                text += reader.pages[page_num].extract_text() + "\n\n"
-        return text
+        if fitz is not None:
+            with fitz.open(pdf_file_path) as doc:
+                page_count = doc.page_count
+                if page_count < PARALLEL_PDF_MIN_PAGES:
+                    for page in doc:
+                        page_texts.append(page.get_text("text"))
+
+            if page_count >= PARALLEL_PDF_MIN_PAGES:
+                # One contiguous page range per worker, so each worker opens the file only once
+                range_size = -(-page_count // (os.cpu_count() or 1)) # Ceiling division
+                starts = range(0, page_count, range_size)
+                stops = [min(start + range_size, page_count) for start in starts]
+                for range_texts in map_in_cpu_pool(extract_pdf_page_range, [pdf_file_path] * len(starts), starts, stops):
+                    page_texts.extend(range_texts)
+        else:
+            import PyPDF2 # Imported on first use; only needed when PyMuPDF is missing
+            with open(pdf_file_path, 'rb') as file:
+                reader = PyPDF2.PdfReader(file)
+                for page in reader.pages:
+                    page_texts.append(page.extract_text() or "")
+        return "\n\n".join(page_texts)
     except Exception as e:
-        print(f"Error extracting text from PDF {pdf_file_path}: {e}")
+        logger.error("Error extracting text from PDF %s: %s", pdf_file_path, e)
         return None
 
+# Common blog/publishing platforms whose subdomains (e.g. jessmartin.substack.com,
+# blog.hubspot.com) all belong to the same site for link-discovery purposes.
+_PLATFORM_DOMAINS = ('substack.com', 'medium.com', 'gitconnected.com', 'freecodecamp.org', 'hubspot.com')
+_PLATFORM_SUFFIXES = tuple('.' + platform_domain for platform_domain in _PLATFORM_DOMAINS)
+
+@functools.lru_cache(maxsize=8192)
 def get_base_domain(url):
     """
     Extracts the base domain from a URL, normalizing for common subdomains.
     This is used for filtering links to ensure we stay within the intended website
-    or its relevant subdomains during link discovery.
+    or its relevant subdomains during link discovery. Results are memoized, since
+    the same URLs are looked up repeatedly while crawling an index page.
     
     Args:
         url (str): The URL string.
@@ -119,32 +442,144 @@ def get_base_domain(url):
     parsed_uri = urlparse(url)
     netloc = parsed_uri.netloc.replace('www.', '') # Remove 'www.'
     
-    # Generic normalization for common blog/publishing platforms
-    if netloc.endswith('.substack.com'):
-        return 'substack.com'
-    if netloc.endswith('.medium.com'):
-        return 'medium.com'
-    if netloc.endswith('.gitconnected.com'):
-        return 'gitconnected.com'
-    if netloc.endswith('.freecodecamp.org'):
-        return 'freecodecamp.org'
-    if netloc.endswith('.hubspot.com'): # For blog.hubspot.com
-        return 'hubspot.com'
+    # Generic normalization for common blog/publishing platforms.
+    # A single endswith() over all suffixes rules out the common (non-platform) case.
+    if netloc.endswith(_PLATFORM_SUFFIXES):
+        for platform_domain, platform_suffix in zip(_PLATFORM_DOMAINS, _PLATFORM_SUFFIXES):
+            if netloc.endswith(platform_suffix):
+                return platform_domain
 
     return netloc
 
+# Query parameters that only track where a visitor came from and never change the page.
+_TRACKING_QUERY_PARAMS = frozenset(('fbclid', 'gclid', 'mc_cid', 'mc_eid'))
+
+def is_tracking_param(key):
+    """
+    Tells whether a query parameter name is a pure tracking parameter (`utm_*`,
+    `fbclid`, ...) that can be dropped without changing the page.
+    
+    Args:
+        key (str): The query parameter name.
+        
+    Returns:
+        bool: True if the parameter only tracks the visitor.
+    """
+    return key.startswith('utm_') or key in _TRACKING_QUERY_PARAMS
+
+def strip_tracking_params(url):
+    """
+    Removes tracking query parameters from a URL and leaves everything else
+    (path, trailing slash, other parameters and their order) as it was, so the
+    URL still fetches the same page but is stored without the tracking noise.
+    
+    Args:
+        url (str): The URL string.
+        
+    Returns:
+        str: The URL without tracking parameters.
+    """
+    parsed = urlparse(url)
+    if not parsed.query:
+        return url
+    query_pairs = parsed.query.split('&')
+    kept_pairs = [pair for pair in query_pairs if not is_tracking_param(pair.split('=', 1)[0])]
+    if len(kept_pairs) == len(query_pairs):
+        return url
+    return urlunparse(parsed._replace(query='&'.join(kept_pairs)))
+
+def canonicalize_url(url):
+    """
+    Normalizes a URL for de-duplication, so trivially different spellings of the
+    same page (a `#fragment`, a trailing slash, `utm_*` tracking parameters, a
+    different query parameter order) are only scraped once. Other query parameters
+    are kept, since some sites identify articles by them (e.g. `?p=123`).
+    
+    Args:
+        url (str): The URL string.
+        
+    Returns:
+        str: The canonical form of the URL.
+    """
+    parsed = urlparse(url)
+    query = parsed.query
+    if query:
+        query_params = [
+            (key, value) for key, value in parse_qsl(query, keep_blank_values=True)
+            if not is_tracking_param(key)
+        ]
+        query = urlencode(sorted(query_params))
+    return urlunparse(parsed._replace(path=parsed.path.rstrip('/'), query=query, fragment=''))
+
+def content_fingerprint(content):
+    """
+    Computes a compact fingerprint of an article's content, used to skip mirrored
+    or syndicated copies of an article that was already scraped from another URL.
+    
+    Args:
+        content (str): The article content (Markdown).
+        
+    Returns:
+        bytes: A 16-byte BLAKE2b digest of the content.
+    """
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+
+def to_ndjson_line(item):
+    """
+    Serializes a scraped item as one line of NDJSON (newline-delimited JSON).
+    
+    Args:
+        item (dict): The scraped item.
+        
+    Returns:
+        bytes: The item as UTF-8 encoded JSON, followed by a newline.
+    """
+    if orjson is not None:
+        return orjson.dumps(item) + b'\n'
+    return (json.dumps(item, ensure_ascii=False) + '\n').encode('utf-8')
+
+# Each run writes its NDJSON output to its own directory under here. Gradio copies the file
+# into its own cache when serving it, so our copies only need to live briefly.
+OUTPUT_DIR = os.path.join(os.environ.get('GRADIO_TEMP_DIR') or tempfile.gettempdir(), 'scraper_output')
+
+# Output directories whose file has not been written to for this long are removed.
+OUTPUT_MAX_AGE_SECONDS = 3600
+
+def remove_old_outputs():
+    """
+    Deletes the output directories of earlier runs that are older than
+    `OUTPUT_MAX_AGE_SECONDS`, so a long-running server does not keep a copy of
+    every crawl on disk. Age is measured from the last write to the run's file,
+    so a crawl that is still writing is left alone.
+    """
+    cutoff = time.time() - OUTPUT_MAX_AGE_SECONDS
+    try:
+        run_dirs = [entry.path for entry in os.scandir(OUTPUT_DIR) if entry.is_dir()]
+    except FileNotFoundError:
+        return # No run has written output yet
+    for run_dir in run_dirs:
+        try:
+            last_write = max(entry.stat().st_mtime for entry in os.scandir(run_dir))
+        except ValueError: # Empty directory: fall back to its own timestamp
+            last_write = os.path.getmtime(run_dir)
+        except OSError:
+            continue # Removed by another run in the meantime
+        if last_write < cutoff:
+            shutil.rmtree(run_dir, ignore_errors=True)
+
 # --- SECTION 2: WEB ARTICLE EXTRACTION (GENERIC & RULE-FREE) ---
 # This is where `trafilatura` shines, eliminating site-specific CSS selectors.
 
-def scrape_web_article_generic(url):
+def scrape_web_article_generic(url, downloaded_html):
     """
     Generically scrapes a web article using the `trafilatura` library.
     This function implements the "no custom code, no rules" principle for web content extraction.
-    `trafilatura` automatically downloads, parses, and extracts the main content, title, authors,
-    and other metadata from virtually any given article URL using advanced heuristics.
+    `trafilatura` parses the already-downloaded page and extracts the main content, title,
+    authors, and other metadata from virtually any article using advanced heuristics.
     
     Args:
         url (str): The URL of the web page to scrape.
+        downloaded_html (str): The page's decoded HTML, as returned by `fetch_html`.
         
     Returns:
         dict or None: A dictionary containing the scraped data
@@ -152,37 +587,34 @@ def scrape_web_article_generic(url):
                       or None if scraping fails.
     """
     try:
-        # trafilatura.fetch_url handles downloading with good defaults (user-agent, retries)
-        downloaded_html = trafilatura.fetch_url(url)
-        
-        if not downloaded_html:
-            print(f"Trafilatura failed to download HTML for {url}. Skipping this URL.")
-            return None # Cannot proceed without HTML content
-
-        # Use trafilatura.extract to get the main content and metadata.
-        # output_format='json' is ideal as it gives us structured data directly.
-        extracted_json_str = trafilatura.extract(
-            downloaded_html,
+        # Parse the page once; the same tree is used for content and metadata extraction.
+        tree = trafilatura.load_html(downloaded_html)
+        if tree is None:
+            logger.info("Trafilatura could not parse HTML from %s. Skipping this URL.", url)
+            return None
+
+        # Use trafilatura.extract to get the main content directly as Markdown.
+        content_markdown = trafilatura.extract(
+            tree,
             url=url, # Provide URL for better context for trafilatura's internal logic
-            output_format='json',
+            output_format='markdown',
             include_comments=False,    # Usually don't want comments in main article content
             include_links=True,        # Preserve links within the content
-            include_formatting=True    # Preserve bold, italics, etc.
+            include_formatting=True,   # Preserve bold, italics, etc.
+            fast=True                  # Skip the slower fallback extractors (jusText/readability)
         )
 
-        if not extracted_json_str:
-            print(f"Trafilatura extracted no article data from {url}. Content might not be an article or site blocks extraction.")
+        if not content_markdown:
+            logger.info("Trafilatura extracted no article data from %s. Content might not be an article or site blocks extraction.", url)
             return None # If trafilatura finds no article, it's not an article for our purpose
 
-        # Parse the JSON string into a Python dictionary
-        parsed_data = json.loads(extracted_json_str)
+        # Title and author come from the page metadata (only needed once we know it's an article)
+        metadata = trafilatura.extract_metadata(tree, default_url=url, extensive=False)
 
         # Map trafilatura's output to the desired JSON format
-        title = parsed_data.get("title", os.path.basename(urlparse(url).path.strip('/')) or url)
-        authors = parsed_data.get("author", "Unknown")
-        # trafilatura's 'text' field is often already clean or Markdown-like.
-        # We pass it through html_to_markdown for consistency and extra cleanup.
-        content_markdown = html_to_markdown(parsed_data.get("text", ""))
+        title = metadata.title or os.path.basename(urlparse(url).path.strip('/')) or url
+        authors = metadata.author or "Unknown"
+        content_markdown = tidy_markdown(content_markdown)
 
         return {
             "title": title,
@@ -194,13 +626,46 @@ def scrape_web_article_generic(url):
         }
 
     except Exception as e:
-        print(f"An error occurred during generic web scraping for {url} with Trafilatura: {e}")
+        logger.error("An error occurred during generic web scraping for %s with Trafilatura: %s", url, e)
         return None
 
 # --- SECTION 3: GENERIC LINK DISCOVERY (FOR "EVERY BLOG POST") ---
 # This section enables the scraper to find and process multiple articles from index pages.
 
-def get_all_links_from_page(url, base_domain):
+# Path fragments that mark common navigational/non-article pages, combined into a
+# single alternation so each link costs one regex scan instead of a chain of substring checks.
+_NON_ARTICLE_PATH_RE = re.compile(r'/(?:category/|tag/|archive/|about|contact|privacy)')
+
+# Common non-article file extensions (documents, archives, images, media).
+_NON_ARTICLE_EXTENSION_RE = re.compile(r'\.(?:pdf|docx|xlsx|zip|rar|tar|gz|jpe?g|png|gif|svg|mp[34]|avi|mov)$', re.IGNORECASE)
+
+# href schemes that can never lead to a crawlable page; rejected before any URL parsing.
+_NON_HTTP_SCHEMES = ('mailto:', 'javascript:', 'tel:', 'data:')
+
+# Selects the href of every anchor on a page; compiled once, evaluated in C.
+_HREF_XPATH = lxml.etree.XPath('//a/@href')
+
+# lxml parsers can be reused across documents but not shared between threads, and link
+# discovery runs on worker threads, so each thread keeps its own parser.
+_thread_local = threading.local()
+
+def get_thread_html_parser():
+    """
+    Returns this thread's reusable lxml HTML parser, creating it on first use.
+    
+    Returns:
+        lxml.html.HTMLParser: A forgiving HTML parser owned by the calling thread.
+    """
+    parser = getattr(_thread_local, 'html_parser', None)
+    if parser is None:
+        # Pages arrive already decoded and are re-encoded as UTF-8 for lxml (which rejects
+        # str input that carries an XML encoding declaration), so the parser must not
+        # re-detect the encoding from a stale <meta charset>.
+        parser = lxml.html.HTMLParser(recover=True, remove_blank_text=True, encoding='utf-8')
+        _thread_local.html_parser = parser
+    return parser
+
+def get_all_links_from_page(url, base_domain, html_content):
     """
     Generically discovers all internal article-like links from a given web page.
     This function performs the "crawling" aspect, identifying URLs that likely
@@ -211,21 +676,61 @@ def get_all_links_from_page(url, base_domain):
         url (str): The URL of the page (e.g., a blog index) to extract links from.
         base_domain (str): The normalized base domain of the current scraping session
                            to filter for internal links.
+        html_content (str): The page's decoded HTML, as returned by `fetch_html`.
                            
     Returns:
         set: A set of unique, absolute URLs that are potential article links.
     """
-    html_content = get_html_content_basic(url)
-    if not html_content:
-        return set() # Return empty set if page can't be fetched
+    # Collect the href of every anchor (<a>) tag on the page
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(html_content)
+        hrefs = [node.attributes.get('href') for node in tree.css('a[href]')]
+    else:
+        tree = lxml.html.fromstring(html_content.encode('utf-8'), parser=get_thread_html_parser())
+        hrefs = _HREF_XPATH(tree)
+
+    return filter_article_links(url, base_domain, hrefs)
 
-    soup = BeautifulSoup(html_content, 'html.parser')
+def filter_article_links(url, base_domain, hrefs):
+    """
+    Resolves links found on (or listed for) a page and keeps only the internal,
+    article-like ones. Shared by HTML link discovery and sitemap discovery so both
+    apply the same heuristics.
+    
+    Args:
+        url (str): The URL of the page the links belong to; relative links are resolved against it.
+        base_domain (str): The normalized base domain of the current scraping session
+                           to filter for internal links.
+        hrefs (iterable): Raw href values or absolute URLs.
+                           
+    Returns:
+        set: A set of unique, absolute URLs that are potential article links.
+    """
     found_urls = set()
 
-    # Find all anchor (<a>) tags on the page
-    for link_tag in soup.find_all('a', href=True):
-        href = link_tag['href']
-        full_url = urljoin(url, href) # Resolve relative URLs
+    # Parse the page URL once; most hrefs can then be resolved without `urljoin`.
+    parsed_page_url = urlparse(url)
+    page_scheme = parsed_page_url.scheme
+    page_origin = f"{page_scheme}://{parsed_page_url.netloc}"
+
+    for href in hrefs:
+        # Cheap string checks first: skip empty hrefs, same-page anchors and non-web schemes
+        if not href or href[0] == '#' or href.startswith(_NON_HTTP_SCHEMES):
+            continue
+
+        # Resolve relative URLs. Absolute, protocol-relative and root-relative links (the
+        # common cases) are resolved directly; anything else ('./' or '../' segments,
+        # page-relative paths) goes through `urljoin`.
+        if '/.' in href:
+            full_url = urljoin(url, href)
+        elif href.startswith(('http://', 'https://')):
+            full_url = href
+        elif href.startswith('//'):
+            full_url = page_scheme + ':' + href
+        elif href[0] == '/':
+            full_url = page_origin + href
+        else:
+            full_url = urljoin(url, href)
 
         # Basic filtering to ensure it's a valid HTTP(S) link and not a fragment
         if not full_url.startswith(('http://', 'https://')):
@@ -241,19 +746,14 @@ def get_all_links_from_page(url, base_domain):
 
         # Further simple heuristic: Exclude common non-article file extensions.
         # This is generic and helps avoid media files, zips, etc.
-        if re.search(r'\.(pdf|docx|xlsx|zip|rar|tar|gz|jpg|jpeg|png|gif|svg|mp3|mp4|avi|mov)$', full_url, re.IGNORECASE):
+        if _NON_ARTICLE_EXTENSION_RE.search(full_url):
             continue
 
         # More refined path filtering: Try to avoid common navigational/non-article paths.
         # This is a generic heuristic, not specific to any site's design.
         parsed_link_path = urlparse(full_url).path.lower()
         if (parsed_link_path.endswith('/') and len(parsed_link_path.strip('/')) < 5) or \
-           '/category/' in parsed_link_path or \
-           '/tag/' in parsed_link_path or \
-           '/archive/' in parsed_link_path or \
-           '/about' in parsed_link_path or \
-           '/contact' in parsed_link_path or \
-           '/privacy' in parsed_link_path:
+           _NON_ARTICLE_PATH_RE.search(parsed_link_path):
            continue
 
 
@@ -265,145 +765,295 @@ def get_all_links_from_page(url, base_domain):
 # This section sets up the web UI using Gradio and orchestrates the overall
 # data ingestion process based on user inputs.
 
-def run_scraper_tool(team_id, user_id, urls_input, pdf_file_obj):
+async def process_url(client, url, host_semaphore, use_sitemap=False):
     """
-    The main function for the Gradio interface. It manages a queue of URLs
-    to process, handling both direct article URLs and index pages (by
-    discovering links from them). All content is extracted generically.
+    Processes a single queued URL: downloads it once, scrapes it as an article, or,
+    if no article is found, discovers candidate article links on it. Article extraction
+    runs in the CPU pool and link parsing in a worker thread, so neither holds up the
+    other fetches on the event loop.
     
     Args:
-        team_id (str): The team identifier provided by the user.
-        user_id (str): The user identifier for attributing scraped items.
-        urls_input (str): A comma-separated string of initial URLs to scrape.
-        pdf_file_obj (gradio.inputs.File or None): Gradio file object representing an uploaded PDF.
-                                                    
+        client (httpx.AsyncClient): The crawl's shared HTTP client.
+        url (str): The URL to process.
+        host_semaphore (asyncio.Semaphore): Caps simultaneous requests to this URL's host.
+        use_sitemap (bool): If True and the page is not an article, look for the site's
+                            sitemaps first and only parse the page's links if none list
+                            any articles under this URL.
+        
     Returns:
-        dict: The final output JSON structure containing all scraped items.
+        tuple: (item, discovered_links) where `item` is the scraped article dict or None,
+               and `discovered_links` is a set of URLs found when `item` is None.
     """
-    final_output = {
-        "team_id": team_id if team_id else "default_team_id",
-        "items": []
-    }
+    async with host_semaphore:
+        await asyncio.sleep(reserve_host_slot(url)) # Be polite: space out requests to the same host
+        html_content = await fetch_html(client, url)
+    if not html_content:
+        return None, set() # Cannot proceed without HTML content
+
+    # First, try to scrape it as a generic article using Trafilatura
+    item = await run_in_cpu_pool(scrape_web_article_generic, url, html_content)
+    if item:
+        return item, set()
+
+    # If Trafilatura did NOT find an article (e.g., it's an index page, or site blocked it)
+    # Then, attempt to discover links from this page
+    # Sitemaps list a site's articles directly, so prefer them for the index pages users start from
+    if use_sitemap and sitemap_search is not None:
+        logger.info("  -> Trafilatura found no article. Searching sitemaps for: %s", url)
+        # trafilatura downloads the sitemaps itself, so take one of this host's slots for the
+        # duration of the search; it spaces its sitemap requests `POLITE_DELAY_SECONDS` apart.
+        # This is looser than the crawl's own politeness: trafilatura first fetches the homepage,
+        # robots.txt and the first sitemap back to back, the host's other slot(s) can still serve
+        # crawl requests meanwhile, and a search that times out keeps fetching in the background.
+        async with host_semaphore:
+            await asyncio.sleep(reserve_host_slot(url))
+            try:
+                # A daemon thread, so a search that times out cannot delay the end of the run
+                sitemap_urls = await asyncio.wait_for(
+                    run_in_daemon_thread(sitemap_search, url, sleep_time=POLITE_DELAY_SECONDS,
+                                         max_sitemaps=SITEMAP_MAX_SITEMAPS),
+                    timeout=SITEMAP_TIMEOUT_SECONDS,
+                )
+            except asyncio.TimeoutError:
+                logger.info("  -> Sitemap search timed out for: %s", url)
+                sitemap_urls = []
+        discovered_links = filter_article_links(url, get_base_domain(url), sitemap_urls)
+        if len(discovered_links) > SITEMAP_MAX_URLS:
+            logger.info("  -> Sitemaps list %s articles; queueing the first %s", len(discovered_links), SITEMAP_MAX_URLS)
+            # Keep the sitemaps' own order, so the cut is stable between runs
+            kept_links = set()
+            for sitemap_url in sitemap_urls:
+                if sitemap_url in discovered_links:
+                    kept_links.add(sitemap_url)
+                    if len(kept_links) == SITEMAP_MAX_URLS:
+                        break
+            discovered_links = kept_links
+        if discovered_links:
+            return None, discovered_links
+
+    logger.info("  -> Trafilatura found no article. Attempting generic link discovery from: %s", url)
+    discovered_links = await asyncio.to_thread(get_all_links_from_page, url, get_base_domain(url), html_content)
+    return None, discovered_links
+
+async def crawl_urls(start_urls, handle_item):
+    """
+    Crawls from the given URLs, following links discovered on index pages.
+    Keeps up to `MAX_CONCURRENT_FETCHES` URLs in flight on a single event loop,
+    with politeness (at most `MAX_FETCHES_PER_HOST` concurrent requests, spaced
+    `POLITE_DELAY_SECONDS` apart) enforced per host rather than globally.
+    
+    Args:
+        start_urls (list): Unique, valid http(s) URLs to start from.
+        handle_item (callable): Called with each scraped article dict as soon as it completes,
+                                so the crawl never holds more than the articles in flight.
+        
+    Returns:
+        int: The number of articles scraped.
+    """
+    scraped_count = 0
     
     # Use a deque for efficient appends/pops (queue-like behavior)
     url_queue = deque()
-    # Keep track of URLs that have been added to the queue OR already processed
-    processed_urls = set() 
+    # Keep track of the canonical form of URLs that have been added to the queue OR already processed
+    processed_urls = set()
+    # Fingerprints of the content already scraped, to skip duplicate copies at other URLs
+    seen_fingerprints = set()
+
+    for url in start_urls:
+        url = strip_tracking_params(url)
+        canonical_url = canonicalize_url(url)
+        if canonical_url not in processed_urls:
+            url_queue.append(url)
+            processed_urls.add(canonical_url)
+    # Only the user's own start URLs get a sitemap search; pages discovered from them use their links
+    sitemap_urls = set(url_queue)
+
+    # One semaphore per host, created on first use
+    host_semaphores = defaultdict(lambda: asyncio.Semaphore(MAX_FETCHES_PER_HOST))
+
+    async with create_http_client() as client:
+        in_flight = {} # Maps each pending task to the URL it is processing
+        while url_queue or in_flight:
+            while url_queue and len(in_flight) < MAX_CONCURRENT_FETCHES:
+                current_url = url_queue.popleft() # Get the next URL from the front of the queue
+                logger.info("Processing URL: %s", current_url)
+                host_semaphore = host_semaphores[urlparse(current_url).netloc]
+                use_sitemap = current_url in sitemap_urls
+                in_flight[asyncio.create_task(process_url(client, current_url, host_semaphore, use_sitemap))] = current_url
+
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                current_url = in_flight.pop(task)
+                try:
+                    item, discovered_links = task.result()
+                except Exception as e:
+                    logger.error("An unhandled error occurred while processing URL %s: %s", current_url, e)
+                    continue
+
+                if item:
+                    fingerprint = content_fingerprint(item["content"])
+                    if fingerprint in seen_fingerprints:
+                        logger.info("  -> Skipping duplicate content: %s from %s", item['title'], current_url)
+                        continue
+                    seen_fingerprints.add(fingerprint)
+
+                    # If Trafilatura successfully extracted an article, pass it on to the output
+                    handle_item(item)
+                    scraped_count += 1
+                    logger.info("  -> Successfully scraped: %s from %s", item['title'], current_url)
+
+                # Add newly discovered, unprocessed links to the queue
+                for link in discovered_links:
+                    link = strip_tracking_params(link) # Queue (and later store) the clean URL
+                    canonical_link = canonicalize_url(link)
+                    if canonical_link not in processed_urls:
+                        url_queue.append(link)
+                        processed_urls.add(canonical_link)
+                        logger.debug("    -> Discovered link: %s", link)
+
+    return scraped_count
+
+def run_scraper_tool(team_id, user_id, urls_input, pdf_file_obj):
+    """
+    The main function for the Gradio interface. It crawls the given URLs,
+    handling both direct article URLs and index pages (by discovering links
+    from them), then processes the optional PDF. All content is extracted generically.
+    Each scraped item is written to an NDJSON file as soon as it is ready, so memory
+    use does not grow with the number of items.
     
-    scraped_count = 0
+    Args:
+        team_id (str): The team identifier provided by the user.
+        user_id (str): The user identifier for attributing scraped items.
+        urls_input (str): A comma-separated string of initial URLs to scrape.
+        pdf_file_obj (str, file object or None): The uploaded PDF, as a file path or a
+                                                 Gradio file object.
+    Returns:
+        tuple: (summary, ndjson_path) where `summary` is a dict with the team ID and the
+               number of items scraped, and `ndjson_path` is the path of the NDJSON file
+               (one scraped item per line).
+    """
+    team_id = team_id if team_id else "default_team_id"
+    user_id = user_id if user_id else "default_user"
 
-    # 1. Add initial URLs to the queue
+    # 1. Collect the valid, unique initial URLs
+    start_urls = []
     if urls_input:
         initial_urls = [u.strip() for u in urls_input.split(',') if u.strip()]
         for url in initial_urls:
-            if url.startswith(('http://', 'https://')) and url not in processed_urls:
-                url_queue.append(url)
-                processed_urls.add(url)
+            if url.startswith(('http://', 'https://')) and url not in start_urls:
+                start_urls.append(url)
             else:
-                print(f"Skipping invalid or duplicate initial URL: {url}")
+                logger.warning("Skipping invalid or duplicate initial URL: %s", url)
 
-    # 2. Process URLs from the queue
-    while url_queue:
-        current_url = url_queue.popleft() # Get the next URL from the front of the queue
-        print(f"Processing URL: {current_url}")
-        
-        # Determine the base domain for link discovery
-        current_base_domain = get_base_domain(current_url)
+    # Start extracting the PDF (if uploaded) on a background thread, so it runs alongside the
+    # crawl; the extraction itself fans its pages out to the CPU pool.
+    pdf_future = None
+    if pdf_file_obj:
+        pdf_path = getattr(pdf_file_obj, 'name', pdf_file_obj) # Gradio passes a file path or a file object
+        logger.info("Processing PDF file: %s", pdf_path)
+        pdf_executor = ThreadPoolExecutor(max_workers=1)
+        pdf_future = pdf_executor.submit(extract_text_from_pdf, pdf_path)
+        pdf_executor.shutdown(wait=False) # The thread exits once the extraction is done
 
-        try:
-            # First, try to scrape it as a generic article using Trafilatura
-            item = scrape_web_article_generic(current_url)
-            
-            if item:
-                # If Trafilatura successfully extracted an article, add it to output
-                item["user_id"] = user_id if user_id else "default_user"
-                final_output["items"].append(item)
+    # Clear out earlier runs' output, then give this run a directory of its own
+    remove_old_outputs()
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    ndjson_path = os.path.join(tempfile.mkdtemp(dir=OUTPUT_DIR), 'scraped_items.ndjson')
+
+    scraped_count = 0
+    with open(ndjson_path, 'wb') as output_file:
+        def write_item(item):
+            item["user_id"] = user_id
+            output_file.write(to_ndjson_line(item))
+
+        # 2. Crawl the URLs concurrently, writing each article as it completes
+        if start_urls:
+            scraped_count += asyncio.run(crawl_urls(start_urls, write_item))
+
+        # 3. Collect the PDF content (if uploaded)
+        if pdf_future:
+            pdf_content = pdf_future.result()
+            if pdf_content:
+                pdf_title = os.path.basename(pdf_path).replace(".pdf", "").replace("_", " ").title()
+                write_item({
+                    "title": f"{pdf_title} (Book Chapters)",
+                    "content": pdf_content,
+                    "content_type": "book",
+                    "source_url": "Aline's Book (Google Drive)",
+                    "author": "Aline"
+                })
                 scraped_count += 1
-                print(f"  -> Successfully scraped: {item['title']} from {current_url}")
+                logger.info("  -> Successfully processed PDF: %s", pdf_title)
             else:
-                # If Trafilatura did NOT find an article (e.g., it's an index page, or site blocked it)
-                # Then, attempt to discover links from this page
-                print(f"  -> Trafilatura found no article. Attempting generic link discovery from: {current_url}")
-                discovered_links = get_all_links_from_page(current_url, current_base_domain)
-                
-                # Add newly discovered, unprocessed links to the queue
-                for link in discovered_links:
-                    if link not in processed_urls:
-                        url_queue.append(link)
-                        processed_urls.add(link)
-                        print(f"    -> Discovered link: {link}")
-            
-        except Exception as e:
-            print(f"An unhandled error occurred while processing URL {current_url}: {e}")
-            
-        time.sleep(1) # Be polite: pause briefly between processing different URLs
+                logger.warning("Could not extract content from PDF: %s", pdf_path)
 
-    # 3. Process PDF File (if uploaded)
-    if pdf_file_obj:
-        print(f"Processing PDF file: {pdf_file_obj.name}")
-        pdf_content = extract_text_from_pdf(pdf_file_obj.name)
-        if pdf_content:
-            pdf_title = os.path.basename(pdf_file_obj.name).replace(".pdf", "").replace("_", " ").title()
-            final_output["items"].append({
-                "title": f"{pdf_title} (Book Chapters)",
-                "content": pdf_content,
-                "content_type": "book",
-                "source_url": "Aline's Book (Google Drive)",
-                "author": "Aline",
-                "user_id": user_id if user_id else "default_user"
-            })
-            scraped_count += 1
-            print(f"  -> Successfully processed PDF: {pdf_title}")
-        else:
-            print(f"Could not extract content from PDF: {pdf_file_obj.name}")
-
-    print(f"Scraping complete. Total items scraped: {scraped_count}")
-    return final_output
-
-# Define the Gradio interface layout and behavior
-iface = gr.Interface(
-    fn=run_scraper_tool,
-    inputs=[
-        gr.Textbox(
-            label="Team ID",
-            placeholder="e.g., aline123 (Required)",
-            value="aline123"
-        ),
-        gr.Textbox(
-            label="User ID (for scraped items)",
-            placeholder="e.g., aline, jane_smith, my_team_member",
-            value="aline"
-        ),
-        gr.Textbox(
-            label="URLs to Scrape (Comma-separated)",
-            placeholder="""
-            Enter URLs here. This can be:
-            - **Direct Article Links:** e.g., https://medium.com/@datawookie/web-scraping-with-python-and-beautiful-soup-c7ad2a234509
-            - **Blog/Category Index Pages:** The tool will discover articles from these.
-              e.g., https://interviewing.io/blog, https://nilmamano.com/blog/category/dsa
-            - **Other Example Articles (current as of June 2025):**
-              - freeCodeCamp: https://www.freecodecamp.org/news/how-to-code-snake-game-javascript/
-              - Substack: https://jessmartin.substack.com/p/building-an-ai-powered-search-engine
-              - TechCrunch: https://techcrunch.com/2024/06/18/eu-launches-ai-office-to-implement-ai-act-and-drive-global-collaboration/
-              - The Verge: https://www.theverge.com/2024/6/18/24180424/apple-wwdc-2024-ai-iphone-ios-18-mac-features-takeaways (Note: NyTimes often blocks)
-              - Wired: https://www.wired.com/story/apple-ai-intelligence-ios-18-macos-sonoma-privacy/
-            """,
-            lines=8
-        ),
-        gr.File(
-            label="Upload PDF Book (Optional - First 8 Chapters)",
-            type="filepath",
-            file_types=[".pdf"]
-        )
-    ],
-    outputs=gr.JSON(label="Scraped Data Output (JSON)"),
-    title="📚 Knowledgebase Scraper: Truly Scalable & Rule-Free Content Ingestion �",
-    description="""
+    logger.info("Scraping complete. Total items scraped: %s", scraped_count)
+    final_output = {
+        "team_id": team_id,
+        "count": scraped_count
+    }
+    return final_output, ndjson_path
 
+def create_interface():
     """
-)
+    Builds the Gradio web UI for `run_scraper_tool`. Gradio is imported here rather
+    than at module level, since it pulls in a large dependency tree (fastapi,
+    pydantic, numpy, ...) that the scraping functions themselves never need.
+    
+    Returns:
+        gr.Interface: The interface, ready to `launch()`.
+    """
+    import gradio as gr # For creating the web-based graphical user interface (GUI)
+
+    # Define the Gradio interface layout and behavior
+    return gr.Interface(
+        fn=run_scraper_tool,
+        inputs=[
+            gr.Textbox(
+                label="Team ID",
+                placeholder="e.g., aline123 (Required)",
+                value="aline123"
+            ),
+            gr.Textbox(
+                label="User ID (for scraped items)",
+                placeholder="e.g., aline, jane_smith, my_team_member",
+                value="aline"
+            ),
+            gr.Textbox(
+                label="URLs to Scrape (Comma-separated)",
+                placeholder="""
+                Enter URLs here. This can be:
+                - **Direct Article Links:** e.g., https://medium.com/@datawookie/web-scraping-with-python-and-beautiful-soup-c7ad2a234509
+                - **Blog/Category Index Pages:** The tool will discover articles from these.
+                  e.g., https://interviewing.io/blog, https://nilmamano.com/blog/category/dsa
+                - **Other Example Articles (current as of June 2025):**
+                  - freeCodeCamp: https://www.freecodecamp.org/news/how-to-code-snake-game-javascript/
+                  - Substack: https://jessmartin.substack.com/p/building-an-ai-powered-search-engine
+                  - TechCrunch: https://techcrunch.com/2024/06/18/eu-launches-ai-office-to-implement-ai-act-and-drive-global-collaboration/
+                  - The Verge: https://www.theverge.com/2024/6/18/24180424/apple-wwdc-2024-ai-iphone-ios-18-mac-features-takeaways (Note: NyTimes often blocks)
+                  - Wired: https://www.wired.com/story/apple-ai-intelligence-ios-18-macos-sonoma-privacy/
+                """,
+                lines=8
+            ),
+            gr.File(
+                label="Upload PDF Book (Optional - First 8 Chapters)",
+                type="filepath",
+                file_types=[".pdf"]
+            )
+        ],
+        outputs=[
+            gr.JSON(label="Scrape Summary (JSON)"),
+            gr.File(label="Scraped Items (NDJSON, one item per line)")
+        ],
+        title="📚 Knowledgebase Scraper: Truly Scalable & Rule-Free Content Ingestion �",
+        description="""
+
+        """
+    )
 
 # --- SECTION 5: APPLICATION ENTRY POINT ---
 # This block ensures the Gradio interface launches when the script is run directly.
 if __name__ == "__main__":
+    configure_console_logging()
+    iface = create_interface()
     iface.launch(debug=True) # `debug=True` provides more verbose output in the console